@@ -2,9 +2,11 @@
 
 import os
 import logging
+import functools
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
 def _get_env(key: str, default: str | None = None, required: bool = False) -> str:
     """Безопасное получение переменной окружения с валидацией."""
     value = os.environ.get(key, default)
@@ -12,6 +14,7 @@ def _get_env(key: str, default: str | None = None, required: bool = False) -> st
         raise ValueError(f"Обязательная переменная окружения {key} не установлена")
     return value
 
+@functools.lru_cache(maxsize=None)
 def _get_int_env(key: str, default: int) -> int:
     """Получение целочисленной переменной окружения."""
     try:
@@ -20,6 +23,14 @@ def _get_int_env(key: str, default: int) -> int:
         logger.warning(f"Неверное значение для {key}, используется значение по умолчанию: {default}")
         return default
 
+@functools.lru_cache(maxsize=None)
+def _get_bool_env(key: str, default: bool) -> bool:
+    """Получение логической переменной окружения (1/true/yes/on)."""
+    value = os.environ.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 # Обязательные переменные
 BOT_TOKEN            = _get_env("BOT_TOKEN", required=True)
 CHAT_ID              = int(_get_env("CHAT_ID", required=True))
@@ -33,6 +44,14 @@ PATTERN              = _get_env("PATTERN", r"free_flats_\d{8}\.pdf")
 NEWS_LINK_RE         = _get_env("NEWS_LINK_RE", r"^/novosti/\d+")
 CHECK_EVERY_MINUTES  = _get_int_env("CHECK_EVERY_MINUTES", 30)
 STATE_FILE           = _get_env("STATE_FILE", "state/last.json")
+# Хеш для обнаружения изменений PDF и страницы: sha256 или blake2b (быстрее без SHA-NI).
+# После смены алгоритма сохранённые хеши не совпадут, и по одному уведомлению придёт повторно
+HASH_ALGORITHM       = _get_env("HASH_ALGORITHM", "sha256").lower()
+# Сколько секунд переиспользовать найденные PDF/новость между задачей и командами
+FETCH_CACHE_SECONDS  = _get_int_env("FETCH_CACHE_SECONDS", 30)
+# Не скачивать PDF, если имя файла совпадает с последним отправленным.
+# Выключено по умолчанию: новая редакция может выйти под тем же именем.
+PDF_SKIP_SAME_NAME   = _get_bool_env("PDF_SKIP_SAME_NAME", False)
 STRANICA_URL         = _get_env("STRANICA_URL", "https://uksgomel.by/stranica-1")
 STRANICA_CHECK_INTERVAL = _get_int_env("STRANICA_CHECK_INTERVAL", 60)  # в минутах
 
@@ -59,6 +78,12 @@ def validate_config():
     if STRANICA_CHECK_INTERVAL < 1:
         errors.append("STRANICA_CHECK_INTERVAL должен быть >= 1")
     
+    if HASH_ALGORITHM not in ("sha256", "blake2b"):
+        errors.append("HASH_ALGORITHM должен быть sha256 или blake2b")
+    
+    if FETCH_CACHE_SECONDS < 0:
+        errors.append("FETCH_CACHE_SECONDS должен быть >= 0")
+    
     if MAX_FILE_SIZE_MB < 1 or MAX_FILE_SIZE_MB > 50:
         errors.append("MAX_FILE_SIZE_MB должен быть от 1 до 50")
     
@@ -6,41 +6,45 @@ Health check скрипт для Docker контейнера.
 
 import os
 import sys
-import json
 import time
+import orjson
+
+STATE_FILE = os.environ.get("STATE_FILE", "state/last.json")
 
 def check_health():
     """Проверяет здоровье приложения."""
-    state_file = os.environ.get("STATE_FILE", "state/last.json")
+    state_file = STATE_FILE
     
-    # Проверяем существование файла состояния (означает, что бот работал)
-    if not os.path.exists(state_file):
-        # Если файла нет, это может быть первый запуск - это нормально
-        # Проверяем, что директория существует и доступна для записи
-        state_dir = os.path.dirname(state_file)
-        if state_dir and not os.path.exists(state_dir):
-            try:
-                os.makedirs(state_dir, exist_ok=True)
-            except Exception:
-                return False
-        
-        # Проверяем возможность записи
+    # Одна попытка открыть файл вместо exists() + open()
+    try:
+        with open(state_file, "rb") as f:
+            # Проверяем, что файл состояния валидный JSON
+            orjson.loads(f.read())
+        # Файл есть - бот уже работал и писал состояние, проверка записи не нужна
+        return True
+    except FileNotFoundError:
+        pass
+    except (orjson.JSONDecodeError, OSError):
+        # Поврежденный файл - это проблема, но не критичная
+        return True
+    
+    # Если файла нет, это может быть первый запуск - это нормально
+    # Проверяем, что директория существует и доступна для записи
+    state_dir = os.path.dirname(state_file)
+    if state_dir:
         try:
-            test_file = state_file + ".healthcheck"
-            with open(test_file, "w") as f:
-                json.dump({"healthcheck": time.time()}, f)
-            os.remove(test_file)
+            os.makedirs(state_dir, exist_ok=True)
         except Exception:
             return False
     
-    # Проверяем, что файл состояния валидный JSON
+    # Проверяем возможность записи
     try:
-        if os.path.exists(state_file):
-            with open(state_file, "r", encoding="utf-8") as f:
-                json.load(f)
-    except (json.JSONDecodeError, IOError):
-        # Поврежденный файл - это проблема, но не критичная
-        pass
+        test_file = state_file + ".healthcheck"
+        with open(test_file, "wb") as f:
+            f.write(orjson.dumps({"healthcheck": time.time()}))
+        os.remove(test_file)
+    except Exception:
+        return False
     
     return True
 
@@ -1,17 +1,20 @@
 import os
 import re
-import json
+import asyncio
 import logging
 import hashlib
+import functools
 import signal
 import sys
+import time
+import orjson
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from datetime import datetime
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from telegram import Update
 from telegram.ext import (
     ApplicationBuilder,
@@ -63,10 +66,31 @@ session.headers.update({
     "Connection": "keep-alive"
 })
 
+# Регулярные выражения компилируются один раз при импорте
+# Дата в имени бывает как ГГГГММДД, так и ДДММГГГГ
+_PDF_RE       = re.compile(
+    r"free_flats_(?:(?P<y1>20\d{2})(?P<m1>[01]\d)(?P<d1>[0-3]\d)"
+    r"|(?P<d2>[0-3]\d)(?P<m2>[01]\d)(?P<y2>20\d{2}))_?\.pdf$"
+)
+# Таблица экранирования спецсимволов MarkdownV2 (включая обратный слэш)
+_MD2_ESCAPE = str.maketrans({c: "\\" + c for c in "\\_*[]()~`>#+-=|{}.!"})
+# Меняющиеся от запроса к запросу фрагменты страницы: CSRF-токены и время
+_STRIP_VOLATILE_RE = re.compile(rb'<meta[^>]*csrf[^>]*>|<input[^>]*_token[^>]*>|\d{2}:\d{2}:\d{2}')
+
+# Не более двух одновременных HTTP-обменов с сайтом на все задачи и команды
+_http_sem = asyncio.Semaphore(2)
+
+async def _run_blocking(func, *args, **kwargs):
+    """Выполняет блокирующий вызов (HTTP через requests) в отдельном потоке,
+    чтобы не останавливать event loop бота на время сетевого обмена."""
+    async with _http_sem:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
 # ──────────────────────────────────────────────────────────
 # Кэш состояния для уменьшения I/O операций
 _state_cache: dict | None = None
-_state_file_lock = False
+# Сериализует запись состояния между задачами и командами
+_state_lock = asyncio.Lock()
 
 def load_state() -> dict:
     """Загружает состояние из файла с кэшированием."""
@@ -77,129 +101,293 @@ def load_state() -> dict:
     
     if os.path.exists(config.STATE_FILE):
         try:
-            with open(config.STATE_FILE, "r", encoding="utf-8") as f:
-                st = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
+            with open(config.STATE_FILE, "rb") as f:
+                st = orjson.loads(f.read())
+        except (orjson.JSONDecodeError, IOError) as e:
             logger.warning(f"Ошибка при чтении состояния: {e}, используем пустое состояние")
             st = {}
     else:
         st = {}
     
-    st.setdefault("last_pdf",            None)
-    st.setdefault("last_pdf_hash",       None)
-    st.setdefault("last_news_url",       None)
-    st.setdefault("last_stranica_hash",  None)
+    st.setdefault("last_pdf",                    None)
+    st.setdefault("last_pdf_hash",               None)
+    st.setdefault("last_pdf_etag",               None)
+    st.setdefault("last_pdf_last_modified",      None)
+    st.setdefault("last_news_url",               None)
+    st.setdefault("last_stranica_hash",          None)
+    st.setdefault("last_stranica_etag",          None)
+    st.setdefault("last_stranica_last_modified", None)
     
     _state_cache = st
     return st
 
-def save_state(st: dict):
-    """Сохраняет состояние в файл атомарно."""
-    global _state_cache, _state_file_lock
-    
-    if _state_file_lock:
-        logger.warning("Попытка сохранения состояния во время другой операции")
-        return
+def _write_state(st: dict):
+    """Атомарно записывает состояние в файл через временный файл."""
+    global _state_cache
     
-    _state_file_lock = True
+    temp_file = config.STATE_FILE + ".tmp"
     try:
-        # Атомарная запись через временный файл
-        temp_file = config.STATE_FILE + ".tmp"
-        with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump(st, f, ensure_ascii=False, indent=2)
+        with open(temp_file, "wb") as f:
+            f.write(orjson.dumps(st, option=orjson.OPT_INDENT_2))
         os.replace(temp_file, config.STATE_FILE)
-        _state_cache = st.copy()
+        # Диск больше не читаем: кэш и есть актуальное состояние
+        _state_cache = st
     except IOError as e:
         logger.error(f"Ошибка при сохранении состояния: {e}", exc_info=True)
-    finally:
-        _state_file_lock = False
+        _discard(temp_file)
+
+async def save_state(st: dict):
+    """
+    Сохраняет состояние в файл. Одновременные сохранения ждут друг друга,
+    а не теряются; запись на диск идёт в отдельном потоке.
+    """
+    async with _state_lock:
+        await asyncio.to_thread(_write_state, st)
+
+def _ttl_cached(func):
+    """
+    Кэширует удачный результат fetch-функции на config.FETCH_CACHE_SECONDS секунд,
+    чтобы /getpdf сразу после плановой проверки не качал страницу заново.
+    Пустой результат (None, None) — ошибка или нет данных — не кэшируется.
+    """
+    cached = None
+    cached_at = 0.0
+
+    @functools.wraps(func)
+    def wrapper():
+        nonlocal cached, cached_at
+        now = time.monotonic()
+        if cached is not None and now - cached_at < config.FETCH_CACHE_SECONDS:
+            return cached
+        result = func()
+        if result[0] is not None:
+            cached, cached_at = result, now
+        else:
+            cached = None
+        return result
+
+    return wrapper
+
+# Значения конфигурации не меняются после старта: связываем их с глобальными
+# именами модуля, чтобы горячие задачи не обращались к атрибутам config
+_BASE_URL      = config.BASE_URL.rstrip("/")
+_PAGE_URL      = config.PAGE_URL
+_NEWS_URL      = config.NEWS_PAGE_URL
+_STRANICA_URL  = config.STRANICA_URL
+_CHAT_ID       = config.CHAT_ID
+_MAX_FILE_SIZE = config.MAX_FILE_SIZE
+
+def _join_url(href: str) -> str:
+    """
+    Абсолютный URL для ссылки со страницы. Пути от корня сайта ("/files/...")
+    просто приклеиваются к BASE_URL, абсолютные ссылки возвращаются как есть;
+    остальное разбирает urljoin.
+    """
+    if href.startswith("/") and not href.startswith("//"):
+        return _BASE_URL + href
+    if href.startswith(("http://", "https://")):
+        return href
+    return urljoin(config.BASE_URL, href)
 
 # ──────────────────────────────────────────────────────────
+# Валидаторы страниц со ссылками и результат их последнего разбора:
+# URL -> (ETag, Last-Modified, результат)
+_page_validators: dict[str, tuple[str | None, str | None, tuple]] = {}
+
+def _fetch_parsed(url: str, parse) -> tuple:
+    """
+    Условный GET страницы url и разбор её через parse. На 304 Not Modified
+    возвращает результат прошлого разбора: тело не качается и не парсится.
+    Ошибки requests пробрасываются вызывающему.
+    """
+    cached = _page_validators.get(url)
+    headers = _conditional_headers(cached[0], cached[1]) if cached else None
+    resp = session.get(url, headers=headers, timeout=10)
+    if resp.status_code == 304 and cached:
+        return cached[2]
+    resp.raise_for_status()
+
+    result = parse(resp.content)
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if result[0] is not None and (etag or last_modified):
+        _page_validators[url] = (etag, last_modified, result)
+    else:
+        _page_validators.pop(url, None)
+    return result
+
+@_ttl_cached
 def fetch_latest_pdf() -> tuple[str, str] | tuple[None, None]:
-    """Находит последний PDF файл. Оптимизировано: убраны лишние HEAD запросы."""
+    """
+    Находит последний по дате PDF файл. Доступность не проверяется:
+    устаревшую ссылку (404) обрабатывает скачивание в scheduled_pdf.
+    """
     try:
-        resp = session.get(config.PAGE_URL, timeout=10)
-        resp.raise_for_status()
+        return _fetch_parsed(_PAGE_URL, _parse_pdf_listing)
     except requests.exceptions.RequestException as e:
-        logger.error(f"Ошибка при загрузке страницы {config.PAGE_URL}: {e}")
+        logger.error(f"Ошибка при загрузке страницы {_PAGE_URL}: {e}")
         return None, None
-    
-    soup = BeautifulSoup(resp.text, "html.parser")
-    candidates = []
-    
-    # Предкомпилируем регулярное выражение для производительности
-    pdf_pattern = re.compile(r"(free_flats_(\d{8})_?\.pdf)$")
-    date_formats = ("%Y%m%d", "%d%m%Y")
-    
-    for a in soup.find_all("a", href=True):
-        m = pdf_pattern.search(a["href"])
-        if not m:
-            continue
-
-        fname = m.group(1)
-        ds = m.group(2)
-        dt = None
-        
-        for fmt in date_formats:
-            try:
-                dt = datetime.strptime(ds, fmt)
-                break
-            except ValueError:
-                continue
-        
-        if not dt:
-            continue
 
-        url = urljoin(config.BASE_URL, a["href"])
-        candidates.append((dt, fname, url))
+# Один парсер на все разборы. Комментарии и инструкции обработки в дерево
+# не попадают, словарь id элементов не собирается: XPath по id не используется.
+# Одновременный разбор из двух потоков lxml сериализует сам.
+_HTML_PARSER = lxml.html.HTMLParser(remove_comments=True, remove_pis=True, collect_ids=False)
 
-    if not candidates:
+def _html_tree(html: bytes):
+    """
+    Строит дерево lxml напрямую из байтов ответа (кодировку lxml определяет сам).
+    Для пустого документа возвращает None.
+    """
+    try:
+        return lxml.html.fromstring(html, parser=_HTML_PARSER)
+    except etree.ParserError:
+        return None
+
+def _date_key(m: re.Match) -> int | None:
+    """
+    Ключ сортировки по дате из имени PDF: целое ГГГГММДД для обоих форматов
+    имени, без создания datetime. Для явно неверных месяца/дня — None.
+    """
+    year  = int(m["y1"] or m["y2"])
+    month = int(m["m1"] or m["m2"])
+    day   = int(m["d1"] or m["d2"])
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        return None
+    return year * 10_000 + month * 100 + day
+
+@functools.lru_cache(maxsize=4)
+def _parse_pdf_listing(html: bytes) -> tuple[str, str] | tuple[None, None]:
+    """Разбирает страницу со списком PDF. Неизменившаяся страница повторно не парсится."""
+    tree = _html_tree(html)
+    if tree is None:
+        return None, None
+    # XPath в libxml2 отдаёт только href ссылок на free_flats_*, regex проверяет остаток.
+    # Генераторы не собирают список кандидатов: max() проходит их один раз
+    hrefs = tree.xpath('//a[contains(@href, "free_flats_")]/@href')
+    matches = (_PDF_RE.search(href) for href in hrefs)
+    keyed = ((_date_key(m), m) for m in matches if m)
+    newest = max(((dt, m) for dt, m in keyed if dt is not None),
+                 key=lambda x: x[0], default=None)
+
+    if newest is None:
         return None, None
-    
-    # Находим самый свежий файл по дате
-    _, fname, furl = max(candidates, key=lambda x: x[0])
-    return fname, furl
 
+    # Абсолютный URL строим только для самого свежего файла
+    m = newest[1]
+    return m.group(0), _join_url(m.string)
+
+@_ttl_cached
 def fetch_latest_news() -> tuple[str, str] | tuple[None, None]:
     """Получает последнюю новость с сайта."""
     try:
-        resp = session.get(config.NEWS_PAGE_URL, timeout=10)
-        resp.raise_for_status()
+        return _fetch_parsed(_NEWS_URL, _parse_latest_news)
     except requests.exceptions.RequestException as e:
-        logger.error(f"Ошибка при загрузке новостей {config.NEWS_PAGE_URL}: {e}")
+        logger.error(f"Ошибка при загрузке новостей {_NEWS_URL}: {e}")
         return None, None
+
+@functools.lru_cache(maxsize=4)
+def _parse_latest_news(html: bytes) -> tuple[str, str] | tuple[None, None]:
+    """Находит первую ссылку на новость. Неизменившаяся страница повторно не парсится."""
+    tree = _html_tree(html)
+    if tree is None:
+        return None, None
+    links = tree.xpath('//a[starts-with(@href, "/novosti/")]')
     
-    soup = BeautifulSoup(resp.text, "html.parser")
-    # Предкомпилируем регулярное выражение
-    news_pattern = re.compile(r"^/novosti/")
-    a = soup.find("a", href=news_pattern)
-    
-    if not a:
+    if not links:
         return None, None
 
-    title = a.get_text(strip=True)
-    url = urljoin(config.BASE_URL, a["href"])
+    a = links[0]
+    # Схлопываем переводы строк и пробелы из вложенной разметки заголовка
+    title = " ".join(a.text_content().split())
+    url = _join_url(a.get("href"))
     return title, url
 
-def fetch_stranica() -> str:
+def _new_hash():
+    """Хеш для обнаружения изменений (не для криптографии), см. config.HASH_ALGORITHM."""
+    if config.HASH_ALGORITHM == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    return hashlib.sha256()
+
+def fetch_stranica_hash(headers: dict | None = None) -> tuple[str, dict] | None:
     """
-    Скачиваем и возвращаем чистый текст body страницы STRANICA_URL.
+    Скачиваем страницу STRANICA_URL и возвращаем хеш её тела без изменчивых
+    фрагментов вместе с заголовками ответа. DOM не строим, а хеш считаем здесь же,
+    в рабочем потоке, так что тело страницы не покидает функцию.
+    При 304 Not Modified на условный запрос возвращает None.
     """
     try:
-        resp = session.get(config.STRANICA_URL, timeout=10)
+        resp = session.get(_STRANICA_URL, headers=headers, timeout=10)
+        if resp.status_code == 304:
+            return None
         resp.raise_for_status()
     except requests.exceptions.RequestException as e:
-        logger.error(f"Ошибка при загрузке страницы {config.STRANICA_URL}: {e}")
+        logger.error(f"Ошибка при загрузке страницы {_STRANICA_URL}: {e}")
         raise
     
-    soup = BeautifulSoup(resp.text, "html.parser")
-    # получаем только текст внутри тега <body>
-    if soup.body is None:
-        logger.warning(f"Тег <body> не найден на странице {config.STRANICA_URL}")
-        return ""
-    
-    content = soup.body.get_text(separator="\n", strip=True)
-    return content
+    body = _STRIP_VOLATILE_RE.sub(b"", resp.content)
+    h = _new_hash()
+    h.update(body)
+    return h.hexdigest(), resp.headers
+
+def _conditional_headers(etag: str | None, last_modified: str | None) -> dict:
+    """Заголовки условного GET по сохранённым ETag / Last-Modified."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+def download_file(url: str, local: str, headers: dict | None = None,
+                  max_size: int | None = None) -> tuple[str, int, dict] | None:
+    """
+    Потоково скачивает файл по url в local, считая хеш на лету.
+    Возвращает (хеш, размер в байтах, заголовки ответа); в памяти держится
+    только один чанк. Если сервер ответил 304 Not Modified, возвращает None.
+    Как только размер превышает max_size, скачивание прерывается: возвращённый
+    размер больше max_size, а хеш и файл неполные.
+    """
+    h = _new_hash()
+    size = 0
+    with session.get(url, headers=headers, stream=True, timeout=15) as r:
+        if r.status_code == 304:
+            return None
+        r.raise_for_status()
+        if max_size is not None:
+            try:
+                declared = int(r.headers.get("Content-Length", 0))
+            except ValueError:
+                declared = 0
+            if declared > max_size:
+                return "", declared, r.headers
+        with open(local, "wb") as f:
+            for chunk in r.iter_content(1024 * 1024):
+                h.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    break
+        return h.hexdigest(), size, r.headers
+
+def _discard(path: str):
+    """Удаляет временный файл, если он есть."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _update_validators(st: dict, name: str, headers) -> bool:
+    """
+    Сохраняет ETag / Last-Modified ресурса name ("pdf", "stranica") в состоянии.
+    Возвращает True, если они изменились.
+    """
+    etag          = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if (etag, last_modified) == (st[f"last_{name}_etag"], st[f"last_{name}_last_modified"]):
+        return False
+    st[f"last_{name}_etag"]          = etag
+    st[f"last_{name}_last_modified"] = last_modified
+    return True
 
 # ──────────────────────────────────────────────────────────
 async def scheduled_pdf(context: ContextTypes.DEFAULT_TYPE):
@@ -208,16 +396,30 @@ async def scheduled_pdf(context: ContextTypes.DEFAULT_TYPE):
         st        = load_state()
         last_hash = st["last_pdf_hash"]
 
-        fname, furl = fetch_latest_pdf()
+        fname, furl = await _run_blocking(fetch_latest_pdf)
         if not fname:
             logger.debug("PDF файлы не найдены")
             return
 
+        # Имя содержит дату публикации, поэтому то же имя обычно означает тот же файл
+        if config.PDF_SKIP_SAME_NAME and fname == st["last_pdf"]:
+            logger.debug("Имя PDF не изменилось, пропускаем скачивание")
+            return
+
+        local = os.path.join("downloads", fname)
+        part  = local + ".part"
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+
         logger.info(f"Downloading PDF for hash check: {furl}")
+        # Сохранённые ETag / Last-Modified относятся только к последнему файлу:
+        # для нового имени условный запрос не отправляем
+        headers = None
+        if fname == st["last_pdf"]:
+            headers = _conditional_headers(st["last_pdf_etag"], st["last_pdf_last_modified"])
         try:
-            r = session.get(furl, timeout=15)
-            r.raise_for_status()
+            result = await _run_blocking(download_file, furl, part, headers, _MAX_FILE_SIZE)
         except requests.exceptions.HTTPError as err:
+            _discard(part)
             status_code = getattr(err.response, 'status_code', None)
             if status_code == 404:
                 logger.warning(f"PDF ещё не готов (404): {furl}")
@@ -225,54 +427,59 @@ async def scheduled_pdf(context: ContextTypes.DEFAULT_TYPE):
             logger.error(f"HTTPError при скачивании {furl}: {err}", exc_info=True)
             return
         except requests.exceptions.RequestException as err:
+            _discard(part)
             logger.error(f"Ошибка сети при скачивании PDF {furl}: {err}", exc_info=True)
             return
         except Exception as err:
+            _discard(part)
             logger.error(f"Неожиданная ошибка при скачивании PDF: {err}", exc_info=True)
             return
 
-        data = r.content
-        file_size = len(data)
+        if result is None:
+            logger.info("PDF не изменился (304 Not Modified), пропускаем")
+            return
+        new_hash, file_size, resp_headers = result
         
         # Проверяем размер файла
-        if file_size > config.MAX_FILE_SIZE:
+        if file_size > _MAX_FILE_SIZE:
+            _discard(part)
             logger.warning(f"PDF файл слишком большой ({file_size / 1024 / 1024:.2f} MB), пропускаем отправку")
             await context.bot.send_message(
-                chat_id=config.CHAT_ID,
+                chat_id=_CHAT_ID,
                 text=f"⚠️ Обнаружен новый PDF, но файл слишком большой ({file_size / 1024 / 1024:.2f} MB)\n"
                      f"Максимальный размер: {config.MAX_FILE_SIZE_MB} MB\n"
                      f"URL: {furl}"
             )
             return
         
-        new_hash = hashlib.sha256(data).hexdigest()
         if new_hash == last_hash:
+            _discard(part)
             logger.info("PDF hash не изменился, пропускаем")
+            # Тот же файл мог появиться под новым именем. Запоминаем имя и валидаторы,
+            # чтобы следующая проверка обошлась ответом 304
+            renamed = fname != st["last_pdf"]
+            st["last_pdf"] = fname
+            if _update_validators(st, "pdf", resp_headers) or renamed:
+                await save_state(st)
             return
 
-        local = os.path.join("downloads", fname)
-        os.makedirs(os.path.dirname(local), exist_ok=True)
-        with open(local, "wb") as f:
-            f.write(data)
+        os.replace(part, local)
 
         try:
-            await context.bot.send_message(
-                chat_id=config.CHAT_ID,
-                text=f"✅ Вышла новая редакция файла\nРазмер: {file_size / 1024 / 1024:.2f} MB"
-            )
-            
-            # Используем контекстный менеджер для файла
+            # Текст уведомления идёт подписью к документу: один запрос к API вместо двух
             with open(local, "rb") as pdf_file:
                 await context.bot.send_document(
-                    chat_id=config.CHAT_ID,
+                    chat_id=_CHAT_ID,
                     document=pdf_file,
-                    filename=fname
+                    filename=fname,
+                    caption=f"✅ Вышла новая редакция файла\nРазмер: {file_size / 1024 / 1024:.2f} MB"
                 )
             logger.info(f"Sent PDF {fname} ({file_size / 1024 / 1024:.2f} MB)")
             
             st["last_pdf_hash"] = new_hash
             st["last_pdf"]      = fname
-            save_state(st)
+            _update_validators(st, "pdf", resp_headers)
+            await save_state(st)
         except Exception as e:
             logger.error(f"Ошибка при отправке PDF в Telegram: {e}", exc_info=True)
             # Не сохраняем состояние, чтобы попробовать отправить снова при следующей проверке
@@ -286,44 +493,53 @@ async def scheduled_news(context: ContextTypes.DEFAULT_TYPE):
         st            = load_state()
         last_news_url = st["last_news_url"]
 
-        title, url = fetch_latest_news()
+        title, url = await _run_blocking(fetch_latest_news)
         if not url or url == last_news_url:
             return
 
         text = f"📰 Новая новость:\n{title}\n{url}"
-        await context.bot.send_message(chat_id=config.CHAT_ID, text=text)
+        await context.bot.send_message(chat_id=_CHAT_ID, text=text)
         logger.info(f"Sent news {url}")
 
         st["last_news_url"] = url
-        save_state(st)
+        await save_state(st)
     except Exception as e:
         logger.error(f"Критическая ошибка в scheduled_news: {e}", exc_info=True)
 
 async def scheduled_stranica(context: ContextTypes.DEFAULT_TYPE):
     """
-    Проверяем страницу STRANICA_URL на изменения (через хеш body-текста).
+    Проверяем страницу STRANICA_URL на изменения (через хеш тела ответа
+    без изменчивых фрагментов).
     """
     try:
         st         = load_state()
         last_hash  = st["last_stranica_hash"]
 
+        headers = _conditional_headers(st["last_stranica_etag"], st["last_stranica_last_modified"])
         try:
-            content = fetch_stranica()
+            result = await _run_blocking(fetch_stranica_hash, headers)
         except Exception as err:
-            logger.error(f"Ошибка при fetch_stranica: {err}", exc_info=True)
+            logger.error(f"Ошибка при fetch_stranica_hash: {err}", exc_info=True)
             return
 
-        new_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if result is None:
+            # 304 Not Modified: тело не передавалось, хешировать нечего
+            return
+        new_hash, resp_headers = result
+
         if new_hash == last_hash:
+            if _update_validators(st, "stranica", resp_headers):
+                await save_state(st)
             return
 
         # сохраняем новый хеш и шлём уведомление
         st["last_stranica_hash"] = new_hash
-        save_state(st)
+        _update_validators(st, "stranica", resp_headers)
+        await save_state(st)
 
         await context.bot.send_message(
-            chat_id=config.CHAT_ID,
-            text=f"ℹ️ Обновления на странице 1:\n{config.STRANICA_URL}"
+            chat_id=_CHAT_ID,
+            text=f"ℹ️ Обновления на странице 1:\n{_STRANICA_URL}"
         )
         logger.info("Отправка инфы по странице")
     except Exception as e:
@@ -333,10 +549,9 @@ async def scheduled_stranica(context: ContextTypes.DEFAULT_TYPE):
 async def cmd_state(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     """Показывает текущее состояние бота."""
     st = load_state()
-    # Экранируем специальные символы MarkdownV2
-    state_json = json.dumps(st, indent=2, ensure_ascii=False)
-    # Экранируем специальные символы для MarkdownV2
-    escaped_json = state_json.replace("_", "\\_").replace("*", "\\*").replace("[", "\\[").replace("]", "\\]")
+    state_json = orjson.dumps(st, option=orjson.OPT_INDENT_2).decode()
+    # Экранируем специальные символы MarkdownV2 за один проход
+    escaped_json = state_json.translate(_MD2_ESCAPE)
     await update.message.reply_text(
         f"Текущее состояние:\n```json\n{escaped_json}\n```",
         parse_mode="MarkdownV2"
@@ -352,29 +567,41 @@ async def cmd_start(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
     )
 # ──────────────────────────────────────────────────────────
 async def cmd_getpdf(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    fname, furl = fetch_latest_pdf()
+    fname, furl = await _run_blocking(fetch_latest_pdf)
     if not fname:
         return await update.message.reply_text("PDF не найден.")
     local = os.path.join("downloads", fname)
+    # У каждой команды свой временный файл: параллельные /getpdf и scheduled_pdf
+    # не пишут в один и тот же файл, а готовый подменяется атомарно
+    part  = f"{local}.{update.update_id}.part"
     os.makedirs(os.path.dirname(local), exist_ok=True)
     try:
-        r = session.get(furl, stream=True, timeout=15)
-        r.raise_for_status()
-        with open(local, "wb") as f:
-            for chunk in r.iter_content(32_768):
-                f.write(chunk)
-        await ctx.bot.send_message(chat_id=update.effective_chat.id, text="✅ Текущий PDF:")
+        _, file_size, _ = await _run_blocking(
+            download_file, furl, part, max_size=_MAX_FILE_SIZE
+        )
+        if file_size > _MAX_FILE_SIZE:
+            return await update.message.reply_text(
+                f"⚠️ PDF слишком большой для отправки (больше {config.MAX_FILE_SIZE_MB} MB):\n{furl}"
+            )
+        os.replace(part, local)
         with open(local, "rb") as pdf_file:
-            await ctx.bot.send_document(chat_id=update.effective_chat.id, document=pdf_file)
+            await ctx.bot.send_document(
+                chat_id=update.effective_chat.id,
+                document=pdf_file,
+                filename=fname,
+                caption="✅ Текущий PDF"
+            )
     except requests.exceptions.RequestException as err:
         logger.error(f"Ошибка при получении PDF: {err}", exc_info=True)
         await update.message.reply_text(f"❌ Ошибка при загрузке PDF: {err}")
     except Exception as err:
         logger.error(f"Неожиданная ошибка в cmd_getpdf: {err}", exc_info=True)
         await update.message.reply_text("❌ Произошла ошибка при обработке запроса.")
+    finally:
+        _discard(part)
 
 async def cmd_getnews(update: Update, ctx: ContextTypes.DEFAULT_TYPE):
-    title, url = fetch_latest_news()
+    title, url = await _run_blocking(fetch_latest_news)
     if not url:
         return await update.message.reply_text("Новостей не найдено.")
     await ctx.bot.send_message(
@@ -434,15 +661,16 @@ def main():
     app.add_error_handler(global_error_handler)
 
     jq = app.job_queue
+    # Разнесённые по времени старты, чтобы задачи не ходили на сайт одновременно
     jq.run_repeating(scheduled_pdf,
                      interval=config.CHECK_EVERY_MINUTES * 60,
-                     first=5)
+                     first=7)
     jq.run_repeating(scheduled_news,
                      interval=config.NEWS_CHECK_INTERVAL * 60,
-                     first=10)
+                     first=43)
     jq.run_repeating(scheduled_stranica,
                      interval=config.STRANICA_CHECK_INTERVAL * 60,
-                     first=15)
+                     first=91)
 
     app.add_handler(CommandHandler("start",  cmd_start))
     app.add_handler(CommandHandler("state",  cmd_state))
@@ -6,7 +6,8 @@ setup(
     packages=find_packages(),       # найдёт uks_checker
     install_requires=[
         "requests",
-        "beautifulsoup4",
+        "lxml",
+        "orjson",
         "python-telegram-bot",
         # и всё, что ещё в requirements.txt
     ],